@@ -10,6 +10,7 @@ Provides automatic detection and fallback for PostgreSQL client tools:
 
 from __future__ import annotations
 
+import functools
 import os
 import platform
 import shutil
@@ -21,10 +22,13 @@ __all__ = [
     "get_psql_path", 
     "get_pg_restore_path",
     "get_platform_tag",
-    "find_binary"
+    "find_binary",
+    "clear_binary_cache",
+    "resolve_all_tools",
 ]
 
 
+@functools.lru_cache(maxsize=1)
 def get_platform_tag() -> str:
     """Get platform tag for binary directory (e.g., windows-x86_64)."""
     system = platform.system().lower()
@@ -41,6 +45,7 @@ def get_platform_tag() -> str:
     return f"{system}-{machine}"
 
 
+@functools.lru_cache(maxsize=1)
 def get_cache_dir() -> Path:
     """Get user cache directory for binaries."""
     if platform.system() == "Windows":
@@ -51,11 +56,61 @@ def get_cache_dir() -> Path:
     return (cache_base / "koggi" / "bin" / get_platform_tag()).expanduser()
 
 
+@functools.lru_cache(maxsize=1)
 def get_embedded_dir() -> Path:
     """Get embedded binaries directory in package."""
     return Path(__file__).parent.parent / "_bin" / get_platform_tag()
 
 
+PG_TOOLS = ("pg_dump", "psql", "pg_restore")
+
+# Environment variables that override the resolved path of each tool
+TOOL_ENV_VARS = {
+    "pg_dump": "KOGGI_PG_DUMP",
+    "psql": "KOGGI_PSQL",
+    "pg_restore": "KOGGI_PG_RESTORE",
+}
+
+
+_EXE_SUFFIX = ".exe" if platform.system() == "Windows" else ""
+
+
+def _exe_name(name: str) -> str:
+    return name + _EXE_SUFFIX
+
+
+def _scan_dir(directory: Path, wanted: dict[str, str], found: dict[str, Path]) -> None:
+    """Record wanted executables present in directory with a single scandir pass."""
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                tool = wanted.get(entry.name)
+                if tool and tool not in found and entry.is_file():
+                    found[tool] = Path(entry.path)
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_all_binaries(names: tuple[str, ...] = PG_TOOLS) -> dict[str, Path]:
+    """Resolve several tools at once: embedded dir, user cache, then PATH."""
+    wanted = {_exe_name(n): n for n in names}
+    found: dict[str, Path] = {}
+
+    _scan_dir(get_embedded_dir(), wanted, found)
+    _scan_dir(get_cache_dir(), wanted, found)
+
+    # System PATH only for tools the directory scans did not find. shutil.which
+    # keeps its fallbacks: os.defpath when PATH is unset, and the current
+    # directory plus PATHEXT on Windows.
+    for tool in names:
+        if tool not in found and (system_path := shutil.which(tool)):
+            found[tool] = Path(system_path)
+
+    return found
+
+
+@functools.lru_cache(maxsize=8)
 def find_binary(name: str, env_var: Optional[str] = None) -> Optional[Path]:
     """
     Find PostgreSQL binary with fallback priority:
@@ -63,55 +118,50 @@ def find_binary(name: str, env_var: Optional[str] = None) -> Optional[Path]:
     2. Embedded binaries 
     3. User cache
     4. System PATH
+
+    Results are cached per process; call ``clear_binary_cache()`` after
+    installing or removing binaries.
     """
-    exe_name = f"{name}.exe" if platform.system() == "Windows" else name
-    
     # 1. Environment variable override
     if env_var and (env_path := os.environ.get(env_var)):
         env_binary = Path(env_path)
         if env_binary.is_file():
             return env_binary
-    
-    # 2. Embedded binaries in package
-    embedded_binary = get_embedded_dir() / exe_name
-    if embedded_binary.is_file():
-        return embedded_binary
-    
-    # 3. User cache directory
-    cache_binary = get_cache_dir() / exe_name  
-    if cache_binary.is_file():
-        return cache_binary
-    
-    # 4. System PATH
-    if system_path := shutil.which(name):
-        return Path(system_path)
-    
-    return None
+
+    # 2-4. Embedded, cache and PATH resolved together for all PostgreSQL tools
+    names = PG_TOOLS if name in PG_TOOLS else (name,)
+    return _resolve_all_binaries(names).get(name)
+
+
+def clear_binary_cache() -> None:
+    """Forget cached binary lookups so newly installed tools are rediscovered."""
+    _resolve_all_binaries.cache_clear()
+    find_binary.cache_clear()
 
 
 def get_pg_dump_path() -> Path:
     """Get pg_dump binary path with fallbacks."""
-    if binary := find_binary("pg_dump", "KOGGI_PG_DUMP"):
+    if binary := find_binary("pg_dump", TOOL_ENV_VARS["pg_dump"]):
         return binary
     
     # If not found, return expected cache location for download
-    return get_cache_dir() / ("pg_dump.exe" if platform.system() == "Windows" else "pg_dump")
+    return get_cache_dir() / _exe_name("pg_dump")
 
 
 def get_psql_path() -> Path:
     """Get psql binary path with fallbacks.""" 
-    if binary := find_binary("psql", "KOGGI_PSQL"):
+    if binary := find_binary("psql", TOOL_ENV_VARS["psql"]):
         return binary
         
-    return get_cache_dir() / ("psql.exe" if platform.system() == "Windows" else "psql")
+    return get_cache_dir() / _exe_name("psql")
 
 
 def get_pg_restore_path() -> Path:
     """Get pg_restore binary path with fallbacks."""
-    if binary := find_binary("pg_restore", "KOGGI_PG_RESTORE"):
+    if binary := find_binary("pg_restore", TOOL_ENV_VARS["pg_restore"]):
         return binary
         
-    return get_cache_dir() / ("pg_restore.exe" if platform.system() == "Windows" else "pg_restore")
+    return get_cache_dir() / _exe_name("pg_restore")
 
 
 def ensure_binaries_available() -> bool:
@@ -125,12 +175,27 @@ def ensure_binaries_available() -> bool:
     return True
 
 
+def resolve_all_tools() -> dict[str, tuple[Optional[Path], bool]]:
+    """Resolve every PostgreSQL tool in one go.
+
+    Returns {tool: (path, available)}; path is None when the tool is missing.
+    """
+    tools: dict[str, tuple[Optional[Path], bool]] = {}
+    for tool, env_var in TOOL_ENV_VARS.items():
+        path = find_binary(tool, env_var)
+        tools[tool] = (path, path is not None)
+    return tools
+
+
 def get_binary_info() -> dict[str, str]:
     """Get information about resolved binary paths."""
+    cache_dir = get_cache_dir()
+    info = {
+        tool: str(path or cache_dir / _exe_name(tool))
+        for tool, (path, _) in resolve_all_tools().items()
+    }
     return {
-        "pg_dump": str(get_pg_dump_path()),
-        "psql": str(get_psql_path()),
-        "pg_restore": str(get_pg_restore_path()),
+        **info,
         "platform": get_platform_tag(),
         "embedded_dir": str(get_embedded_dir()),
         "cache_dir": str(get_cache_dir()),
@@ -2,30 +2,32 @@
 PostgreSQL binaries downloader.
 
 Downloads and extracts PostgreSQL client tools for the current platform.
-Copies the whole bin directory to ensure Windows DLL dependencies are present.
+Extracts the whole bin directory to ensure Windows DLL dependencies are present.
 """
 
 from __future__ import annotations
 
 import hashlib
+import io
 import os
 import platform
 import shutil
-import tarfile
-import urllib.request
-import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, Optional
+from typing import IO, Callable, Dict, List, Optional, Tuple
 
 from rich.console import Console
 from rich.progress import Progress, DownloadColumn, TransferSpeedColumn
 
-from . import get_cache_dir, get_platform_tag
+from . import PG_TOOLS, _exe_name, clear_binary_cache, get_cache_dir, get_platform_tag
 from ..exceptions import KoggiError
 
 console = Console()
 
-# URL templates for platform-specific binaries (version placeholder: {ver})
+# URL templates for platform-specific binaries (version placeholder: {ver}).
+# Entries may also set "hash_algo" (any hashlib name, e.g. "blake2b" for a
+# faster local integrity check) for their BINARY_CHECKSUMS; defaults to sha256.
 BINARY_URL_TEMPLATES: Dict[str, Dict[str, str]] = {
     # Windows x64 (EDB packaged binaries)
     "windows-x86_64": {
@@ -49,7 +51,28 @@ BINARY_URL_TEMPLATES: Dict[str, Dict[str, str]] = {
     },
 }
 
-REQUIRED_TOOLS = ["pg_dump", "psql", "pg_restore"]
+# Kept for existing imports; the tool list itself lives in the package
+REQUIRED_TOOLS = PG_TOOLS
+
+# Known archive digests per (platform tag, version), in the platform's hash_algo.
+# The URL changes with the version, so a digest only applies to that exact
+# archive; versions without an entry are downloaded unverified.
+BINARY_CHECKSUMS: Dict[Tuple[str, str], str] = {}
+
+DEFAULT_HASH_ALGO = "sha256"
+_TAR_SUFFIXES = (".tar.gz", ".tgz", ".tar.xz")
+
+_IS_WINDOWS = platform.system() == "Windows"
+# Executable file name of each required tool on this platform
+_TOOL_EXE_NAMES = {t: _exe_name(t) for t in PG_TOOLS}
+# O(1) basename lookup when scanning thousands of archive members
+_TOOL_EXE_SET = frozenset(_TOOL_EXE_NAMES.values())
+
+# Copy buffer for archive members, used by _write_member's copyfileobj for both
+# zip and tar (shutil defaults to 64 KiB; 1 MiB on Windows)
+COPY_BUFSIZE = 2 * 1024 * 1024
+# Threads used to write zip members in parallel
+EXTRACT_WORKERS = 4
 
 
 def _fetch_latest_version_from_ftp() -> Optional[str]:
@@ -58,6 +81,8 @@ def _fetch_latest_version_from_ftp() -> Optional[str]:
     We use the source directory as authoritative for latest version numbers,
     then compose platform-specific binary URLs using templates above.
     """
+    import urllib.request
+
     try:
         with urllib.request.urlopen("https://ftp.postgresql.org/pub/source/") as r:  # noqa: S310
             html = r.read().decode("utf-8", errors="ignore")
@@ -84,7 +109,8 @@ def get_download_info(version: Optional[str] = None) -> Optional[Dict[str, str]]
     """Get download info for current platform.
 
     If version is None, attempts to detect the latest stable version.
-    Returns dict with keys: url, extract_path, version.
+    Returns dict with keys: url, extract_path, version, hash_algo
+    (and checksum when BINARY_CHECKSUMS has one for this platform and version).
     """
     platform_tag = get_platform_tag()
     tpl = BINARY_URL_TEMPLATES.get(platform_tag)
@@ -93,105 +119,358 @@ def get_download_info(version: Optional[str] = None) -> Optional[Dict[str, str]]
 
     ver = version or _fetch_latest_version_from_ftp() or "17.6"
     url = tpl["template"].format(ver=ver)
-    return {
+    info = {
         "url": url,
         "extract_path": tpl["extract_path"],
         "version": ver,
+        "hash_algo": tpl.get("hash_algo", DEFAULT_HASH_ALGO),
     }
+    checksum = BINARY_CHECKSUMS.get((platform_tag, ver))
+    if checksum:
+        info["checksum"] = checksum
+    return info
 
 
-def verify_checksum(file_path: Path, expected_sha256: str) -> bool:
-    """Verify file SHA256 checksum."""
-    if not expected_sha256:
+def verify_checksum(file_path: Path, expected: str, hash_algo: str = DEFAULT_HASH_ALGO) -> bool:
+    """Verify file checksum (SHA256 unless another hashlib algorithm is given)."""
+    if not expected:
         return True
-    sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(65536), b""):
-            sha256_hash.update(chunk)
-    return sha256_hash.hexdigest().lower() == expected_sha256.lower()
+    # file_digest reads in C with its own buffer, so skip Python-level buffering
+    with open(file_path, "rb", buffering=0) as f:
+        file_hash = hashlib.file_digest(f, hash_algo)
+    return file_hash.hexdigest().lower() == expected.lower()
+
+
+def _new_progress() -> Progress:
+    """Progress display shared by the download and extract phases."""
+    return Progress(
+        *Progress.get_default_columns(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        console=console,
+    )
+
+
+def _read_buffer_size(total_size: int) -> int:
+    """Pick a read size from Content-Length (8 KiB - 1 MiB, 64 KiB if unknown)."""
+    if not total_size:
+        return 65536
+    return max(8192, min(1 << 20, total_size // 1000))
 
 
-def download_file(url: str, dest_path: Path, expected_size: Optional[int] = None) -> None:
-    """Download file with progress bar."""
+def download_file(
+    url: str,
+    dest_path: Path,
+    expected_size: Optional[int] = None,
+    hash_algo: str = DEFAULT_HASH_ALGO,
+    progress: Optional[Progress] = None,
+) -> str:
+    """Download file with progress bar.
+
+    The digest (SHA256 by default) is computed while streaming, so the archive
+    does not need to be read back from disk for verification. Returns the hex digest.
+    Pass an active ``progress`` to report into it instead of opening a new one.
+    """
     dest_path.parent.mkdir(parents=True, exist_ok=True)
 
     console.print("Downloading PostgreSQL binaries...")
     console.print(f"   URL: {url}")
     console.print(f"   Destination: {dest_path}")
 
-    with Progress(
-        *Progress.get_default_columns(),
-        DownloadColumn(),
-        TransferSpeedColumn(),
-        console=console,
-    ) as progress:
-        task = progress.add_task("Downloading...", total=expected_size)
+    import urllib.request
+
+    file_hash = hashlib.new(hash_algo)
 
-        def progress_hook(block_num: int, block_size: int, total_size: int) -> None:
-            if total_size > 0 and not progress.tasks[task].total:
-                progress.update(task, total=total_size)
-            progress.update(task, advance=block_size)
+    with nullcontext(progress) if progress else _new_progress() as progress:
+        task = progress.add_task("Downloading...", total=expected_size)
 
         try:
-            urllib.request.urlretrieve(url, dest_path, progress_hook)  # noqa: S310
+            with urllib.request.urlopen(url) as resp, open(dest_path, "wb") as f:  # noqa: S310
+                total_size = int(resp.headers.get("Content-Length") or 0)
+                if total_size > 0 and not progress.tasks[task].total:
+                    progress.update(task, total=total_size)
+                buffer_size = _read_buffer_size(total_size)
+                while True:
+                    chunk = resp.read(buffer_size)
+                    if not chunk:
+                        break
+                    file_hash.update(chunk)
+                    f.write(chunk)
+                    progress.update(task, advance=len(chunk))
         except Exception as e:  # noqa: BLE001
             raise KoggiError(f"Download failed: {e}") from e
 
+    return file_hash.hexdigest()
+
+
+def _member_dir(name: str) -> str:
+    """Archive directory of a member name, normalized with a trailing '/'."""
+    if name.startswith("./"):
+        name = name[2:]
+    return name.rpartition("/")[0] + "/"
+
 
-def extract_archive(archive_path: Path, extract_to: Path, extract_path: str) -> None:
-    """Extract archive and copy required tools and dependencies."""
+def _find_bin_prefix(names: List[str], extract_path: str) -> Optional[str]:
+    """Locate the archive directory holding the client tools."""
+    prefix = extract_path.strip("/") + "/"
+    if any(_member_dir(n) == prefix for n in names):
+        return prefix
+    # Fallback: first directory named bin that actually contains a required tool.
+    # Works on member names only, skipping macOS resource-fork junk (__MACOSX/).
+    for name in names:
+        if name.startswith(("__MACOSX/", "./__MACOSX/")):
+            continue
+        d, _, base = name.rpartition("/")
+        if base in _TOOL_EXE_SET and (d == "bin" or d.endswith("/bin")):
+            return _member_dir(name)
+    return None
+
+
+def _write_member(src: IO[bytes], dest: Path) -> Path:
+    """Write src to ``<dest>.part`` and return that path.
+
+    Members only reach their final name through _commit_parts, after the whole
+    archive has been read successfully (zip CRC errors and tar read errors are
+    raised at the end of a member), so a corrupt binary is never left in place.
+    """
+    part = dest.with_name(dest.name + ".part")
+    try:
+        with open(part, "wb") as dst:
+            shutil.copyfileobj(src, dst, length=COPY_BUFSIZE)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    if not _IS_WINDOWS:
+        try:
+            part.chmod(0o755)
+        except Exception:
+            pass
+    return part
+
+
+def _commit_parts(parts: List[Path]) -> None:
+    """Move fully written ``.part`` files onto their final names."""
+    for part in parts:
+        os.replace(part, part.with_name(part.name[: -len(".part")]))
+
+
+def _discard_parts(parts: List[Path]) -> None:
+    for part in parts:
+        try:
+            part.unlink(missing_ok=True)
+        except Exception:
+            pass
+
+
+def extract_archive(
+    archive_path: Path,
+    extract_to: Path,
+    extract_path: str,
+    progress: Optional[Progress] = None,
+) -> None:
+    """Extract the bin directory (tools + DLLs) from the archive directly into extract_to.
+
+    Only members of the bin directory are decompressed; nothing else from the
+    archive touches the disk. Pass an active ``progress`` to report into it.
+    """
+    with nullcontext(progress) if progress else _new_progress() as progress:
+        _extract_archive(archive_path, extract_to, extract_path, progress)
+
+    # Verify required tools are present
+    missing = [tool for tool, exe in _TOOL_EXE_NAMES.items() if not (extract_to / exe).exists()]
+    if missing:
+        raise KoggiError("Archive missing required tools: " + ", ".join(missing))
+
+    console.print(f"Successfully extracted {len(PG_TOOLS)} tools")
+
+
+def _extract_archive(archive_path: Path, extract_to: Path, extract_path: str, progress: Progress) -> None:
     console.print("Extracting binaries...")
+    extract_to.mkdir(parents=True, exist_ok=True)
 
-    temp_extract = extract_to / "temp_extract"
-    temp_extract.mkdir(parents=True, exist_ok=True)
+    parts: List[Path] = []
+    try:
+        _extract_members(archive_path, extract_to, extract_path, progress, parts)
+    except BaseException:
+        _discard_parts(parts)
+        raise
+    _commit_parts(parts)
+
+
+def _extract_members(
+    archive_path: Path,
+    extract_to: Path,
+    extract_path: str,
+    progress: Progress,
+    parts: List[Path],
+) -> None:
+    """Write the bin directory members as ``.part`` files, recording them in parts."""
+    import tarfile
+    import zipfile
+
+    name = archive_path.name.lower()
+    if name.endswith(".zip"):
+        with zipfile.ZipFile(archive_path) as zf:
+            infos = [i for i in zf.infolist() if not i.is_dir()]
+            prefix = _find_bin_prefix([i.filename for i in infos], extract_path)
+            if prefix is None:
+                raise KoggiError("Could not find bin directory in archive")
+            # Zip members are compressed independently, so they can be inflated
+            # and written concurrently (zlib releases the GIL)
+            def write_one(info: zipfile.ZipInfo) -> None:
+                with zf.open(info) as src:
+                    parts.append(_write_member(src, extract_to / info.filename.rpartition("/")[2]))
+                progress.update(task, advance=info.file_size)
+
+            selected = [i for i in infos if _member_dir(i.filename) == prefix]
+            task = progress.add_task("Extracting...", total=sum(i.file_size for i in selected))
+            with ThreadPoolExecutor(max_workers=EXTRACT_WORKERS) as executor:
+                for future in as_completed([executor.submit(write_one, i) for i in selected]):
+                    future.result()
+    elif name.endswith(_TAR_SUFFIXES):
+        # Random-access mode: stream ("r|*") mode is much slower on xz/bz2 archives
+        with tarfile.open(archive_path, mode="r:*") as tf:
+            members = [m for m in tf.getmembers() if m.isfile()]
+            prefix = _find_bin_prefix([m.name for m in members], extract_path)
+            if prefix is None:
+                raise KoggiError("Could not find bin directory in archive")
+            selected = [m for m in members if _member_dir(m.name) == prefix]
+            task = progress.add_task("Extracting...", total=sum(m.size for m in selected))
+            for member in selected:
+                with tf.extractfile(member) as src:
+                    parts.append(_write_member(src, extract_to / member.name.rpartition("/")[2]))
+                progress.update(task, advance=member.size)
+    else:
+        raise KoggiError(f"Unsupported archive format: {archive_path.suffix}")
+
+
+class _HashingReader(io.RawIOBase):
+    """Read-through wrapper that hashes bytes and reports their count as they pass."""
+
+    def __init__(self, raw: IO[bytes], file_hash: hashlib._Hash, on_read: Callable[[int], None]) -> None:
+        self._raw = raw
+        self._hash = file_hash
+        self._on_read = on_read
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:  # type: ignore[override]
+        n = self._raw.readinto(b)
+        if n:
+            self._hash.update(memoryview(b)[:n])
+            self._on_read(n)
+        return n
+
+
+def stream_extract_tar(
+    url: str,
+    extract_to: Path,
+    extract_path: str,
+    checksum: str = "",
+    hash_algo: str = DEFAULT_HASH_ALGO,
+    progress: Optional[Progress] = None,
+) -> None:
+    """Download a tar archive and extract its bin directory in a single pass.
+
+    HTTP response -> decompress -> tar members: the archive itself is never
+    written to disk, only the files of the bin directory. Members are staged
+    as ``.part`` files and only replace the installed binaries once the
+    stream has been read completely, the checksum (computed over the
+    compressed bytes as they stream by) matches and all tools are present.
+    On any failure the staged files are removed and the install is untouched.
+    """
+    import tarfile
+    import urllib.request
+
+    console.print("Downloading and extracting PostgreSQL binaries...")
+    console.print(f"   URL: {url}")
+    console.print(f"   Destination: {extract_to}")
+    extract_to.mkdir(parents=True, exist_ok=True)
+
+    prefix = extract_path.strip("/") + "/"
+    file_hash = hashlib.new(hash_algo)
+    staged: List[Path] = []
 
     try:
-        name = archive_path.name.lower()
-        if name.endswith(".zip"):
-            with zipfile.ZipFile(archive_path) as zf:
-                zf.extractall(temp_extract)
-        elif name.endswith((".tar.gz", ".tgz", ".tar.xz")):
-            with tarfile.open(archive_path) as tf:
-                tf.extractall(temp_extract)
-        else:
-            raise KoggiError(f"Unsupported archive format: {archive_path.suffix}")
-
-        # Locate bin directory
-        source_bin_dir = temp_extract / extract_path
-        if not source_bin_dir.exists():
-            for path in temp_extract.rglob("bin"):
-                if path.is_dir():
-                    source_bin_dir = path
-                    break
-        if not source_bin_dir.exists():
-            raise KoggiError("Could not find bin directory in extracted archive")
-
-        # Copy all files from bin directory to cache (exe + dll + etc)
-        extract_to.mkdir(parents=True, exist_ok=True)
-        for item in source_bin_dir.iterdir():
-            if item.is_file():
-                dst = extract_to / item.name
-                shutil.copy2(item, dst)
-                if platform.system() != "Windows":
-                    try:
-                        dst.chmod(0o755)
-                    except Exception:
+        with nullcontext(progress) if progress else _new_progress() as progress:
+            task = progress.add_task("Downloading...", total=None)
+            extract_task = progress.add_task("Extracting...", total=None)
+
+            try:
+                with urllib.request.urlopen(url) as resp:  # noqa: S310
+                    total_size = int(resp.headers.get("Content-Length") or 0)
+                    if total_size > 0:
+                        progress.update(task, total=total_size)
+                    reader = _HashingReader(resp, file_hash, lambda n: progress.update(task, advance=n))
+                    # Stream ("r|*") mode: the HTTP response is not seekable. Keep
+                    # tarfile's default bufsize; larger ones make its re-slicing of
+                    # the decompression buffer more expensive.
+                    with tarfile.open(fileobj=reader, mode="r|*") as tf:
+                        for member in tf:
+                            if member.isfile() and _member_dir(member.name) == prefix:
+                                dest = extract_to / member.name.rpartition("/")[2]
+                                with tf.extractfile(member) as src:
+                                    staged.append(_write_member(src, dest))
+                                progress.update(extract_task, advance=member.size)
+                    # Hash any trailing padding tarfile did not need to read
+                    while reader.read(COPY_BUFSIZE):
                         pass
+                progress.update(extract_task, total=progress.tasks[extract_task].completed)
+            except Exception as e:  # noqa: BLE001
+                raise KoggiError(f"Download failed: {e}") from e
+
+        if checksum and file_hash.hexdigest().lower() != checksum.lower():
+            raise KoggiError("Downloaded file checksum verification failed")
 
-        # Verify required tools are present
-        missing = []
-        for tool in REQUIRED_TOOLS:
-            exe = f"{tool}.exe" if platform.system() == "Windows" else tool
-            if not (extract_to / exe).exists():
-                missing.append(tool)
+        staged_names = {p.name[: -len(".part")] for p in staged}
+        missing = [tool for tool, exe in _TOOL_EXE_NAMES.items() if exe not in staged_names]
         if missing:
             raise KoggiError("Archive missing required tools: " + ", ".join(missing))
+    except BaseException:
+        _discard_parts(staged)
+        raise
+
+    _commit_parts(staged)
+    console.print(f"Successfully extracted {len(PG_TOOLS)} tools")
+
+
+def _download_and_extract(
+    url: str,
+    cache_dir: Path,
+    extract_path: str,
+    checksum: str,
+    hash_algo: str,
+    force: bool,
+    progress: Progress,
+) -> None:
+    """Download the archive into cache_dir, verify and extract it, then remove it."""
+    archive_path = cache_dir / Path(url).name
 
-        console.print(f"Successfully extracted {len(REQUIRED_TOOLS)} tools")
+    # Download
+    if force and archive_path.exists():
+        try:
+            archive_path.unlink()
+        except Exception:
+            pass
+    # Optionally verify checksum (hashed during download, re-read only for a reused archive)
+    if force or not archive_path.exists():
+        digest = download_file(url, archive_path, hash_algo=hash_algo, progress=progress)
+        checksum_ok = not checksum or digest.lower() == checksum.lower()
+    else:
+        checksum_ok = verify_checksum(archive_path, checksum, hash_algo)
+    if not checksum_ok:
+        raise KoggiError("Downloaded file checksum verification failed")
 
-    finally:
-        if temp_extract.exists():
-            shutil.rmtree(temp_extract, ignore_errors=True)
+    # Extract to cache/bin/<tag>
+    extract_archive(archive_path, cache_dir, extract_path, progress=progress)
+
+    # Cleanup archive
+    try:
+        archive_path.unlink()
+        console.print(f"Cleaned up download file: {archive_path.name}")
+    except Exception:
+        pass
 
 
 def download_postgresql_binaries(
@@ -212,42 +491,31 @@ def download_postgresql_binaries(
 
     # Fast-path if already installed
     if not force:
-        if all((cache_dir / (f"{t}.exe" if platform.system() == "Windows" else t)).exists() for t in REQUIRED_TOOLS):
+        if all((cache_dir / exe).exists() for exe in _TOOL_EXE_NAMES.values()):
             console.print("✅ PostgreSQL binaries already installed")
             return
 
     final_url = url or info["url"]
-    archive_path = cache_dir / Path(final_url).name
-
-    # Download
-    if force and archive_path.exists():
-        try:
-            archive_path.unlink()
-        except Exception:
-            pass
-    if force or not archive_path.exists():
-        download_file(final_url, archive_path)
-
-    # Optionally verify checksum
-    sha = (info or {}).get("sha256") or ""
-    if sha and not verify_checksum(archive_path, sha):
-        raise KoggiError("Downloaded file checksum verification failed")
-
-    # Extract to cache/bin/<tag>
+    # A known digest belongs to the templated archive, not to a --url override
+    checksum = "" if url else (info or {}).get("checksum") or ""
+    hash_algo = (info or {}).get("hash_algo") or DEFAULT_HASH_ALGO
     extract_path = (info or {}).get("extract_path") or ""
     if not extract_path:
         # Try to autodetect within archive later; for now require extract_path via mapping
         # Fallback to common subdir names used by published archives
         extract_path = "pgsql/bin/"
-    extract_archive(archive_path, cache_dir, extract_path)
 
-    # Cleanup archive
-    try:
-        archive_path.unlink()
-        console.print(f"Cleaned up download file: {archive_path.name}")
-    except Exception:
-        pass
+    # One progress display (and renderer thread) for download and extract
+    with _new_progress() as progress:
+        if not url and final_url.lower().endswith(_TAR_SUFFIXES):
+            # Known tar layout: pipe HTTP -> decompress -> extract, no archive on disk.
+            # Zip needs its central directory at the end of the file, so it cannot stream.
+            stream_extract_tar(final_url, cache_dir, extract_path, checksum, hash_algo, progress=progress)
+        else:
+            _download_and_extract(final_url, cache_dir, extract_path, checksum, hash_algo, force, progress)
 
+    # Freshly installed tools must be rediscovered within this process
+    clear_binary_cache()
     console.print("PostgreSQL binaries installation completed!")
 
 
@@ -255,8 +523,7 @@ def check_binaries_status() -> Dict[str, bool]:
     """Check which required binaries are available in cache dir."""
     cache_dir = get_cache_dir()
     status: Dict[str, bool] = {}
-    for tool in REQUIRED_TOOLS:
-        exe = f"{tool}.exe" if platform.system() == "Windows" else tool
+    for tool, exe in _TOOL_EXE_NAMES.items():
         status[tool] = (cache_dir / exe).exists()
     return status
 
@@ -268,15 +535,18 @@ def clean_binaries() -> None:
         console.print("No binaries cache found")
         return
     removed = 0
-    for p in cache_dir.iterdir():
-        try:
-            if p.is_file():
-                p.unlink()
-                removed += 1
-        except Exception:
-            pass
+    # DirEntry.is_file() uses the directory listing (FindNextFileW on Windows)
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            try:
+                if entry.is_file():
+                    os.unlink(entry.path)
+                    removed += 1
+            except Exception:
+                pass
     try:
         cache_dir.rmdir()
     except Exception:
         pass
+    clear_binary_cache()
     console.print(f"Removed {removed} files from {cache_dir}")
@@ -12,24 +12,19 @@ from rich.table import Table
 
 from . import __version__
 from .config.env_loader import load_profiles
-from .database.backup import backup_database
-from .database.restore import restore_database
-from .database.connection import test_connection
 from .exceptions import KoggiError
 from .binaries import (
     get_pg_dump_path,
     get_psql_path,
     get_pg_restore_path,
     get_binary_info,
-)
-from .binaries.downloader import (
-    download_postgresql_binaries,
-    check_binaries_status,
-    clean_binaries,
-    get_download_info,
+    resolve_all_tools,
 )
 from .binaries import get_platform_tag
 
+# Database (psycopg2) and downloader (tarfile/zipfile/urllib) modules are
+# imported inside the commands that need them to keep CLI startup fast.
+
 
 from .rc.commands import rc_app
 
@@ -172,6 +167,8 @@ def config_list() -> None:
 @config_app.command("test")
 def config_test(profile: str = typer.Argument("DEFAULT", help="Profile name, e.g., DEV1, PROD")) -> None:
     """Test database connection for a profile."""
+    from .database.connection import test_connection
+
     profiles = load_profiles()
     if profile not in profiles:
         console.print(f"[red]Profile '{profile}' not found.[/red]")
@@ -233,6 +230,8 @@ def pg_backup(
     no_limit: bool = typer.Option(False, "--no-limit", help="Disable timeout (no time limit)"),
 ):
     """Create a database backup using pg_dump."""
+    from .database.backup import backup_database
+
     profiles = load_profiles()
     if profile not in profiles:
         console.print(f"[red]Profile '{profile}' not found.[/red]")
@@ -282,6 +281,8 @@ def pg_restore(
     no_limit: bool = typer.Option(False, "--no-limit", help="Disable timeout (no time limit)"),
 ):
     """Restore a database from a backup file with interactive file selection."""
+    from .database.restore import restore_database
+
     profiles = load_profiles()
     if profile not in profiles:
         console.print(f"[red]Profile '{profile}' not found.[/red]")
@@ -347,125 +348,20 @@ def pg_restore(
 def binaries_which() -> None:
     """Show resolved paths for pg tools."""
     info = get_binary_info()
-    
+
     table = Table(title="PostgreSQL Binaries Status", box=box.SIMPLE_HEAD)
     table.add_column("Tool")
     table.add_column("Path")
     table.add_column("Status")
     
-    tools = ["pg_dump", "psql", "pg_restore"]
-    for tool in tools:
-        path = info[tool]
-        exists = Path(path).exists()
-        status = "✅ Found" if exists else "❌ Missing"
-        table.add_row(tool, path, status)
+    # Missing tools are listed at the cache location a download would use
+    for tool, (_, available) in resolve_all_tools().items():
+        status = "✅ Found" if available else "❌ Missing"
+        table.add_row(tool, info[tool], status)
     
     console.print(table)
 
 
-@binaries_app.command("download")
-def binaries_download(
-    url: Optional[str] = typer.Option(
-        None,
-        "--url",
-        help="URL to a zip/tar archive containing pg_dump, psql, pg_restore",
-    ),
-    dest: Optional[Path] = typer.Option(
-        None,
-        "--dest",
-        help="Destination directory for binaries (defaults to user cache)",
-    ),
-    force: bool = typer.Option(False, "--force", help="Overwrite existing files"),
-):
-    """Download and install embedded PostgreSQL client binaries."""
-    import tempfile
-    import urllib.request
-    import zipfile
-    import tarfile
-    import shutil
-
-    from .binaries import _user_cache_dir, detect_platform
-
-    target_dir = dest or _user_cache_dir()
-    target_dir.mkdir(parents=True, exist_ok=True)
-
-    if not url:
-        tag = detect_platform().tag
-        console.print(
-            f"[yellow]No URL provided.[/yellow] Please pass --url to a zip/tar archive for {tag}.\n"
-            "Archive must contain pg_dump, psql, pg_restore.\n"
-            "Tip: place manually under the printed destination or set KOGGI_* env vars."
-        )
-        console.print(f"Destination: {target_dir}")
-        raise typer.Exit(code=2)
-
-    console.print(f"Downloading from: {url}")
-    with tempfile.TemporaryDirectory() as td:
-        tmp = Path(td) / "pkg.bin"
-        try:
-            with urllib.request.urlopen(url) as r, open(tmp, "wb") as f:  # noqa: S310
-                shutil.copyfileobj(r, f)
-        except Exception as e:  # noqa: BLE001
-            console.print(f"[red]Download failed:[/red] {e}")
-            raise typer.Exit(code=1)
-
-        extract_dir = Path(td) / "extract"
-        extract_dir.mkdir(parents=True, exist_ok=True)
-
-        try:
-            if zipfile.is_zipfile(tmp):
-                with zipfile.ZipFile(tmp) as zf:
-                    zf.extractall(extract_dir)
-            elif tarfile.is_tarfile(tmp):
-                with tarfile.open(tmp) as tf:
-                    tf.extractall(extract_dir)  # noqa: S202
-            else:
-                # Assume single binary? copy as-is
-                (extract_dir / tmp.name).write_bytes(tmp.read_bytes())
-        except Exception as e:  # noqa: BLE001
-            console.print(f"[red]Extract failed:[/red] {e}")
-            raise typer.Exit(code=1)
-
-        # Find tools within extract_dir
-        info = detect_platform()
-        names = [f"pg_dump{'.exe' if info.os_name=='windows' else ''}",
-                 f"psql{'.exe' if info.os_name=='windows' else ''}",
-                 f"pg_restore{'.exe' if info.os_name=='windows' else ''}"]
-
-        found = {}
-        for root, _, files in os.walk(extract_dir):
-            for n in names:
-                if n in files and n not in found:
-                    found[n] = Path(root) / n
-
-        if not all(n in found for n in names):
-            missing = [n for n in names if n not in found]
-            console.print(
-                f"[red]Archive missing required tools:[/red] {', '.join(missing)}"
-            )
-            raise typer.Exit(code=1)
-
-        # Copy to target_dir
-        for n, src in found.items():
-            dst = target_dir / n
-            if dst.exists() and not force:
-                console.print(f"[yellow]Skip existing[/yellow]: {dst}")
-                continue
-            shutil.copy2(src, dst)
-            if os.name != "nt":
-                mode = dst.stat().st_mode
-                dst.chmod(mode | 0o111)
-
-    console.print("[green]Binaries installed to:[/green] " + str(target_dir))
-    # Show resolution
-    binaries_which()
-    
-    # Show additional info
-    console.print(f"\n📋 Platform: {info['platform']}")
-    console.print(f"📁 Embedded dir: {info['embedded_dir']}")
-    console.print(f"💾 Cache dir: {info['cache_dir']}")
-
-
 @binaries_app.command("download")
 def binaries_download(
     force: bool = typer.Option(False, "--force", "-f", help="Force re-download even if binaries exist"),
@@ -473,6 +369,8 @@ def binaries_download(
     version: Optional[str] = typer.Option(None, "--version", help="PostgreSQL version (e.g., 17.6). Defaults to latest"),
 ) -> None:
     """Download PostgreSQL binaries for current platform."""
+    from .binaries.downloader import download_postgresql_binaries, get_download_info
+
     try:
         if not get_download_info():
             console.print(f"[red]No binaries available for your platform[/red]")
@@ -491,7 +389,8 @@ def binaries_download(
 @binaries_app.command("status")
 def binaries_status() -> None:
     """Check status of PostgreSQL binaries."""
-    status = check_binaries_status()
+    from .binaries.downloader import get_download_info
+
     download_info = get_download_info()
     
     table = Table(title="Binaries Status", box=box.SIMPLE_HEAD)
@@ -500,12 +399,9 @@ def binaries_status() -> None:
     table.add_column("Location")
     
     all_available = True
-    for tool, available in status.items():
+    for tool, (binary_path, available) in resolve_all_tools().items():
         if available:
-            # Find where it's located
-            from .binaries import find_binary
-            binary_path = find_binary(tool)
-            location = str(binary_path) if binary_path else "Unknown"
+            location = str(binary_path)
         else:
             location = "Not found"
             all_available = False
@@ -526,6 +422,8 @@ def binaries_status() -> None:
 @binaries_app.command("clean")
 def binaries_clean() -> None:
     """Remove downloaded PostgreSQL binaries."""
+    from .binaries.downloader import clean_binaries
+
     if typer.confirm("Remove all downloaded PostgreSQL binaries?"):
         clean_binaries()
     else:
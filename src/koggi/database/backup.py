@@ -13,6 +13,7 @@ from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskPr
 from ..config.env_loader import DBProfile
 from ..exceptions import KoggiError
 from ..binaries import get_pg_dump_path, find_binary
+from ..ui import backup_selector
 
 
 console = Console()
@@ -151,4 +152,6 @@ def backup_database(
                 process.wait()
             raise KoggiError(f"Backup failed: {e}") from e
 
+    # New file in the directory: don't serve a stale listing to the selector
+    backup_selector.invalidate(out.parent)
     return out
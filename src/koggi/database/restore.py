@@ -4,6 +4,7 @@ import os
 import subprocess
 import threading
 import time
+from collections import deque
 from pathlib import Path
 from typing import Optional
 
@@ -18,17 +19,94 @@ from ..ui.backup_selector import interactive_backup_selector, quick_latest_selec
 from .cleanup import clean_and_recreate_database, check_database_exists, get_database_size, create_database
 
 
+_BACKUP_SUFFIXES = frozenset({".sql", ".backup", ".dump"})
+# Custom-format archives need pg_restore; everything else is fed to psql
+_BINARY_SUFFIXES = frozenset({".backup", ".dump"})
+
+
 def _pick_latest_backup(backup_dir: Path) -> Optional[Path]:
-    if not backup_dir.exists():
+    # DirEntry caches is_file()/stat(), so each candidate costs at most one syscall
+    try:
+        with os.scandir(backup_dir) as it:
+            candidates = [
+                e
+                for e in it
+                if os.path.splitext(e.name)[1].lower() in _BACKUP_SUFFIXES and e.is_file()
+            ]
+    except FileNotFoundError:
         return None
-    candidates = [
-        p
-        for p in backup_dir.iterdir()
-        if p.is_file() and p.suffix.lower() in {".sql", ".backup", ".dump"}
-    ]
     if not candidates:
         return None
-    return max(candidates, key=lambda p: p.stat().st_mtime)
+    best = max(candidates, key=lambda e: e.stat().st_mtime)
+    return Path(backup_dir) / best.name
+
+
+def _build_pg_restore_cmd(profile: DBProfile, pg_restore: Path, psql: Path, used_file: Path) -> list[str]:
+    """Use pg_restore for custom format backups."""
+    if not pg_restore.exists():
+        raise KoggiError(f"pg_restore required for {used_file.suffix.lower()} files but not found at {pg_restore}")
+
+    return [
+        str(pg_restore),
+        "-h",
+        profile.host,
+        "-p",
+        str(profile.port),
+        "-U",
+        profile.user,
+        "-d",
+        profile.db_name,
+        "--no-password",
+        str(used_file),
+    ]
+
+
+def _build_psql_cmd(profile: DBProfile, pg_restore: Path, psql: Path, used_file: Path) -> list[str]:
+    """Use psql for SQL text files."""
+    if not psql.exists():
+        raise KoggiError(f"psql required for {used_file.suffix.lower()} files but not found at {psql}")
+
+    return [
+        str(psql),
+        "-h",
+        profile.host,
+        "-p",
+        str(profile.port),
+        "-U",
+        profile.user,
+        "-d",
+        profile.db_name,
+        "-f",
+        str(used_file),
+    ]
+
+
+# Parent variables passed through to pg_restore/psql; libpq settings (PG*) are
+# passed through as well. Covers what backup/cleanup get from the full environ:
+# SYSTEMROOT for sockets and APPDATA for pgpass.conf on Windows, library paths
+# for non-system installs, the Kerberos cache for GSSAPI auth, and the user
+# name libpq falls back to.
+_PASSTHROUGH_ENV = frozenset((
+    "PATH", "HOME", "SYSTEMROOT", "APPDATA", "USERPROFILE",
+    "LANG", "LC_ALL", "LC_CTYPE", "LC_MESSAGES", "TZ",
+    "TMPDIR", "TEMP", "TMP",
+    "LD_LIBRARY_PATH", "DYLD_LIBRARY_PATH", "DYLD_FALLBACK_LIBRARY_PATH",
+    "KRB5CCNAME", "KRB5_CONFIG", "KRB5_KTNAME",
+    "USER", "LOGNAME", "USERNAME",
+))
+
+
+def _restore_env(profile: DBProfile) -> dict[str, str]:
+    """Minimal environment for the restore tool instead of a full os.environ copy."""
+    env = {k: v for k, v in os.environ.items() if k in _PASSTHROUGH_ENV or k.startswith("PG")}
+    if profile.password:
+        env["PGPASSWORD"] = profile.password
+    env["PGSSLMODE"] = profile.ssl_mode
+    env["PGCLIENTENCODING"] = "utf-8"
+    return env
+
+
+_RESTORE_BUILDERS = {suffix: _build_pg_restore_cmd for suffix in _BINARY_SUFFIXES}
 
 
 def restore_database(
@@ -54,9 +132,6 @@ def restore_database(
             f"Neither pg_restore ({pg_restore_path}) nor psql ({psql_path}) found. "
             "Install PostgreSQL client tools or use 'koggi binaries download' to get embedded binaries."
         )
-    
-    pg_restore = str(pg_restore_path)
-    psql = str(psql_path)
 
     # Determine which file to use
     if backup_file:
@@ -97,49 +172,11 @@ def restore_database(
             console.print(f"[yellow]⚠️  Database '{profile.db_name}' does not exist. Creating it automatically...[/yellow]")
             create_database(profile, profile.db_name)
 
-    env = os.environ.copy()
-    if profile.password:
-        env["PGPASSWORD"] = profile.password
-    env["PGSSLMODE"] = profile.ssl_mode
-    env["PGCLIENTENCODING"] = "utf-8"
+    env = _restore_env(profile)
 
     suffix = used_file.suffix.lower()
-    if suffix in {".backup", ".dump"}:
-        # Use pg_restore for custom format backups
-        if not pg_restore_path.exists():
-            raise KoggiError(f"pg_restore required for {suffix} files but not found at {pg_restore_path}")
-        
-        cmd = [
-            pg_restore,
-            "-h",
-            profile.host,
-            "-p",
-            str(profile.port),
-            "-U",
-            profile.user,
-            "-d",
-            profile.db_name,
-            "--no-password",
-            str(used_file),
-        ]
-    else:
-        # Use psql for SQL text files
-        if not psql_path.exists():
-            raise KoggiError(f"psql required for {suffix} files but not found at {psql_path}")
-            
-        cmd = [
-            psql,
-            "-h",
-            profile.host,
-            "-p",
-            str(profile.port),
-            "-U",
-            profile.user,
-            "-d",
-            profile.db_name,
-            "-f",
-            str(used_file),
-        ]
+    build = _RESTORE_BUILDERS.get(suffix, _build_psql_cmd)
+    cmd = build(profile, pg_restore_path, psql_path, used_file)
 
     # Execute restore with progress tracking
     console = Console()
@@ -154,49 +191,60 @@ def restore_database(
     ) as progress:
         task = progress.add_task("Restoring", total=None)  # Indeterminate progress
         
+        process = None
+        progress_active = True
         try:
-            # Run the restore process
+            # Run the restore process; stderr is read line by line so verbose
+            # output is never buffered in full. stdout only carries status lines
+            # (SET, CREATE TABLE, COPY n) that were never reported, so discard it
             process = subprocess.Popen(
                 cmd,
                 env=env,
-                stdout=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
+                bufsize=1 << 16,
                 text=True,
                 encoding='utf-8',
                 errors='replace'
             )
             
             # Start progress animation in background
-            progress_active = True
             def update_progress():
                 while progress_active and process.poll() is None:
                     progress.advance(task)
                     time.sleep(0.2)
             
-            # Threading already imported at top
+            # Collect error/warning lines as they arrive, plus a short tail
+            # of stderr for failures that report no such lines
+            error_lines: list[str] = []
+            output_tail: deque[str] = deque(maxlen=20)
+            def read_output():
+                for raw in process.stderr:
+                    line = raw.strip()
+                    if not line:
+                        continue
+                    output_tail.append(line)
+                    lowered = line.lower()
+                    if 'error' in lowered or 'failed' in lowered or 'warning' in lowered:
+                        error_lines.append(line)
+            
             progress_thread = threading.Thread(target=update_progress, daemon=True)
             progress_thread.start()
+            reader_thread = threading.Thread(target=read_output, daemon=True)
+            reader_thread.start()
             
-            # Wait for process to complete and get outputs
-            stdout, stderr = process.communicate(timeout=timeout)
+            # Wait for process to complete, then for the reader to drain the pipe
+            return_code = process.wait(timeout=timeout)
+            reader_thread.join()
             progress_active = False  # Stop progress animation
-            return_code = process.returncode
-            
-            # Filter error/warning lines from stderr
-            error_lines = []
-            if stderr:
-                for line in stderr.split('\n'):
-                    line = line.strip()
-                    if line and ('error' in line.lower() or 'failed' in line.lower() or 'warning' in line.lower()):
-                        error_lines.append(line)
             
             # Check for errors
             if return_code != 0:
                 error_msg = f"Restore failed with exit code {return_code}"
                 if error_lines:
                     error_msg += f"\nErrors:\n" + "\n".join(error_lines)
-                elif stderr:
-                    error_msg += f"\nOutput: {stderr}"
+                elif output_tail:
+                    error_msg += f"\nOutput: " + "\n".join(output_tail)
                 raise KoggiError(error_msg)
                 
             # Show any warnings/errors that occurred during restore
@@ -212,6 +260,9 @@ def restore_database(
                 process.wait()
             timeout_msg = f"Restore operation timed out ({timeout} seconds)"
             raise KoggiError(timeout_msg)
+        except KoggiError:
+            progress_active = False
+            raise
         except Exception as e:
             progress_active = False
             if process and process.poll() is None:
@@ -4,99 +4,190 @@ Interactive backup file selector with pagination.
 
 from __future__ import annotations
 
+import functools
+import heapq
 import os
 import sys
+import time
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.table import Table
 from rich import box
 from rich.text import Text
 
 console = Console()
 
+_BACKUP_EXTS = (".sql", ".backup", ".dump")
 
-def get_backup_files(backup_dir: Path) -> List[Tuple[Path, datetime, int]]:
-    """Get list of backup files with metadata (path, modified_time, size)."""
-    if not backup_dir.exists():
+# Unsorted scans per directory, reused while the directory's own mtime is
+# unchanged. Keyed by realpath so a symlinked backup_dir and the resolved path
+# backup.py invalidates map to the same entry
+_LIST_CACHE: dict[str, Tuple[int, List[Tuple[str, float, int]]]] = {}
+
+
+def invalidate(backup_dir: Path) -> None:
+    """Drop the cached listing of backup_dir, e.g. right after writing a backup."""
+    _LIST_CACHE.pop(os.path.realpath(backup_dir), None)
+
+
+# Backup table columns: (header, style, width, justify)
+_COLUMNS = (
+    ("Key", "yellow", 4, "left"),
+    ("#", "cyan", 3, "left"),
+    ("File Name", "green", None, "left"),
+    ("Size", "magenta", None, "right"),
+    ("Modified", "blue", None, "left"),
+    ("Age", "dim", None, "right"),
+)
+
+
+def _new_table() -> Table:
+    """Fresh, empty backup table built from the shared column spec."""
+    table = Table(box=box.SIMPLE_HEAD)
+    for header, style, width, justify in _COLUMNS:
+        table.add_column(header, style=style, width=width, justify=justify)
+    return table
+
+
+def _iter_backup_entries(backup_dir: Path) -> Iterator[os.DirEntry]:
+    """Yield scandir entries for backup files in backup_dir.
+
+    Entries are filtered by name first, so only candidates pay for is_file()
+    (free via d_type on Linux and the enumeration data on Windows; a stat only
+    for symlinks, which are still followed so linked backups keep showing up).
+    Raises FileNotFoundError/NotADirectoryError like os.scandir.
+    """
+    with os.scandir(backup_dir) as it:
+        for entry in it:
+            if not entry.name.lower().endswith(_BACKUP_EXTS):
+                continue
+            try:
+                if entry.is_file():
+                    yield entry
+            except OSError:
+                continue
+
+
+def _scan_backup_files(backup_dir: Path) -> List[Tuple[str, float, int]]:
+    """Unsorted (path, mtime, size) tuples for backup_dir, cached per directory mtime.
+
+    Paths are the plain entry.path strings; Path objects are only built for
+    the file that is actually returned to the caller.
+
+    Callers must not mutate the returned list.
+    """
+    key = os.path.realpath(backup_dir)
+    try:
+        dir_mtime_ns = os.stat(key).st_mtime_ns
+    except OSError:
         return []
-    
+    cached = _LIST_CACHE.get(key)
+    if cached and cached[0] == dir_mtime_ns:
+        return cached[1]
+
     backup_files = []
-    for file_path in backup_dir.iterdir():
-        if file_path.is_file() and file_path.suffix.lower() in {".sql", ".backup", ".dump"}:
+    try:
+        # scandir entries cache is_file() and stat() from the directory read
+        # (d_type on Linux, FindNextFileW data on Windows). Size and mtime are
+        # kept in the tuple so nothing downstream has to stat the Path again.
+        for entry in _iter_backup_entries(backup_dir):
             try:
-                stat = file_path.stat()
-                modified_time = datetime.fromtimestamp(stat.st_mtime)
-                size = stat.st_size
-                backup_files.append((file_path, modified_time, size))
-            except (OSError, ValueError):
+                stat = entry.stat()
+            except OSError:
                 continue
-    
-    # Sort by modification time (newest first)
-    backup_files.sort(key=lambda x: x[1], reverse=True)
+            backup_files.append((entry.path, stat.st_mtime, stat.st_size))
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+    _LIST_CACHE[key] = (dir_mtime_ns, backup_files)
     return backup_files
 
 
+def get_backup_files(backup_dir: Path, top_k: Optional[int] = None) -> List[Tuple[str, float, int]]:
+    """Get list of backup files with metadata (path str, mtime, size).
+
+    mtime is the raw st_mtime float; datetimes are only built for rendered rows.
+    With top_k only the top_k newest files are returned, picked with a bounded
+    heap (O(N log K)) instead of sorting the whole listing.
+    The directory scan is cached until the directory changes.
+    """
+    backup_files = _scan_backup_files(backup_dir)
+    # Sort by modification time (newest first)
+    if top_k is not None and top_k < len(backup_files):
+        return heapq.nlargest(top_k, backup_files, key=itemgetter(1))
+    return sorted(backup_files, key=itemgetter(1), reverse=True)
+
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
+@functools.lru_cache(maxsize=512)
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format."""
-    if size_bytes < 1024:
+    # Unit index from the bit length: every 10 bits is one 1024 step
+    i = min(max(0, (size_bytes.bit_length() - 1) // 10), len(_SIZE_UNITS) - 1)
+    if not i:
         return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+    return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
 
 
-def format_time_ago(file_time: datetime) -> str:
+def format_time_ago(mtime: float) -> str:
     """Format how long ago the file was created."""
-    now = datetime.now()
-    diff = now - file_time
+    elapsed = int(time.time() - mtime)
     
-    if diff.days > 0:
-        return f"{diff.days}d ago"
-    elif diff.seconds > 3600:
-        hours = diff.seconds // 3600
-        return f"{hours}h ago"
-    elif diff.seconds > 60:
-        minutes = diff.seconds // 60
-        return f"{minutes}m ago"
+    if elapsed >= 86400:
+        return f"{elapsed // 86400}d ago"
+    elif elapsed > 3600:
+        return f"{elapsed // 3600}h ago"
+    elif elapsed > 60:
+        return f"{elapsed // 60}m ago"
     else:
         return "just now"
 
 
 def display_backup_page(
-    backup_files: List[Tuple[Path, datetime, int]], 
+    backup_files: List[Tuple[str, float, int]], 
     page: int, 
     page_size: int
 ) -> None:
     """Display a page of backup files."""
+    n = len(backup_files)
     start_idx = page * page_size
-    end_idx = min(start_idx + page_size, len(backup_files))
-    page_files = backup_files[start_idx:end_idx]
+    page_files = backup_files[start_idx:start_idx + page_size]
     
-    total_pages = (len(backup_files) + page_size - 1) // page_size
+    total_pages = (n + page_size - 1) // page_size
     
+    _render_table(page_files, start_idx, page, total_pages, n)
+
+
+def _render_table(
+    page_files: List[Tuple[str, float, int]],
+    start_idx: int,
+    page: int,
+    total_pages: int,
+    total: int,
+) -> None:
+    """Clear the screen and render an already-sliced page of backup files.
+
+    Size and mtime come from the listing tuples; files are not re-stat'ed.
+    """
     console.clear()
-    console.print(f"\n[bold blue]📦 Available Backup Files[/bold blue]")
-    console.print(f"[dim]Page {page + 1} of {total_pages} • Total: {len(backup_files)} files[/dim]\n")
+    header = Text.from_markup(
+        "\n[bold blue]📦 Available Backup Files[/bold blue]\n"
+        f"[dim]Page {page + 1} of {total_pages} • Total: {total} files[/dim]\n"
+    )
     
     if not page_files:
-        console.print("[yellow]No backup files found[/yellow]")
+        console.print(header, Text.from_markup("[yellow]No backup files found[/yellow]"), sep="\n")
         return
     
-    table = Table(box=box.SIMPLE_HEAD)
-    table.add_column("Key", style="yellow", width=4)
-    table.add_column("#", style="cyan", width=3)
-    table.add_column("File Name", style="green")
-    table.add_column("Size", style="magenta", justify="right")
-    table.add_column("Modified", style="blue")
-    table.add_column("Age", style="dim", justify="right")
+    table = _new_table()
     
-    for i, (file_path, modified_time, size) in enumerate(page_files):
+    for i, (file_path, mtime, size) in enumerate(page_files):
         idx = start_idx + i + 1
         # Key to press: 1-9 for first 9 items, 0 for 10th item
         if i == 9:
@@ -104,10 +195,10 @@ def display_backup_page(
         else:
             key_to_press = str(i + 1)
         
-        name = file_path.name
+        name = os.path.basename(file_path)
         size_str = format_file_size(size)
-        time_str = modified_time.strftime("%Y-%m-%d %H:%M")
-        age_str = format_time_ago(modified_time)
+        time_str = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M")
+        age_str = format_time_ago(mtime)
         
         table.add_row(
             key_to_press,
@@ -118,15 +209,70 @@ def display_backup_page(
             age_str
         )
     
-    console.print(table)
-    console.print()
+    # One print for header, table and spacer so the page goes out in one write
+    console.print(Group(header, table, Text("")))
+
+
+class _RawTTY:
+    """Keep the terminal in single-keypress mode for a whole selector session.
+
+    Saves the tty settings once on enter and restores them on exit, instead of
+    a tcgetattr/tcsetattr pair around every keypress. cbreak (not raw) mode is
+    used so output post-processing stays on while Rich prints in between reads.
+    No-op on Windows (msvcrt needs no setup). When stdin is not a terminal,
+    ``unavailable`` is set instead so keypresses are read straight from stdin
+    without retrying termios on every key.
+    """
+
+    active = False
+    unavailable = False
+
+    def __init__(self) -> None:
+        self._fd: Optional[int] = None
+        self._saved: Optional[list] = None
+
+    def __enter__(self) -> "_RawTTY":
+        if os.name == 'nt':
+            return self
+        import tty, termios
+        try:
+            fd = sys.stdin.fileno()
+            self._saved = termios.tcgetattr(fd)
+        except (OSError, ValueError, termios.error):
+            _RawTTY.unavailable = True
+            return self
+        self._fd = fd
+        tty.setcbreak(fd)
+        _RawTTY.active = True
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        _RawTTY.unavailable = False
+        if self._fd is None:
+            return
+        import termios
+        termios.tcsetattr(self._fd, termios.TCSADRAIN, self._saved)
+        _RawTTY.active = False
+
+
+def _read_char() -> str:
+    char = sys.stdin.read(1)
+    if not char:
+        raise EOFError
+    return char.lower()
 
 
 def get_single_keypress() -> str:
     """Get a single keypress without requiring Enter."""
     if os.name == 'nt':  # Windows
         import msvcrt
-        return msvcrt.getch().decode('utf-8').lower()
+        char = msvcrt.getch()
+        if char in (b'\x00', b'\xe0'):  # Arrow/function key: drop its scan code byte
+            msvcrt.getch()
+            return ""
+        return char.decode('utf-8', errors='ignore').lower()
+    elif _RawTTY.active or _RawTTY.unavailable:  # Set up (or not a tty) for the session
+        return _read_char()
     else:  # Unix/Linux/macOS
         import tty, termios
         fd = sys.stdin.fileno()
@@ -152,113 +298,127 @@ def show_help() -> None:
     get_single_keypress()
 
 
+# Pages of files ordered when the interactive selector starts
+_PRELOAD_PAGES = 3
+
+
 def interactive_backup_selector(backup_dir: Path, page_size: int = 10) -> Optional[Path]:
     """
     Interactive backup file selector with pagination.
     
     Returns selected file path or None if cancelled.
     """
-    backup_files = get_backup_files(backup_dir)
+    n = len(_scan_backup_files(backup_dir))
     
-    if not backup_files:
+    if not n:
         console.print(f"[yellow]No backup files found in {backup_dir}[/yellow]")
         return None
     
+    # Most sessions pick from the first page or two, so only the newest few
+    # pages are ordered up front; the full sort happens if the user pages past them
+    backup_files = get_backup_files(backup_dir, top_k=page_size * _PRELOAD_PAGES)
     current_page = 0
-    total_pages = (len(backup_files) + page_size - 1) // page_size
+    total_pages = (n + page_size - 1) // page_size
+    # Only re-render the table when the page changes; messages for help,
+    # boundaries and invalid keys are printed below the current table
+    dirty = True
     
-    while True:
-        display_backup_page(backup_files, current_page, page_size)
-        
-        # Show navigation instructions
-        start_idx = current_page * page_size
-        max_items_on_page = min(page_size, len(backup_files) - start_idx)
-        if max_items_on_page == 10:
-            key_range = "[green]1-9,0[/green]"
-        else:
-            key_range = f"[green]1-{max_items_on_page}[/green]"
+    with _RawTTY():
+        while True:
+            if dirty:
+                start_idx = current_page * page_size
+                if start_idx + page_size > len(backup_files) and len(backup_files) < n:
+                    backup_files = get_backup_files(backup_dir)
+                page_files = backup_files[start_idx:start_idx + page_size]
+                _render_table(page_files, start_idx, current_page, total_pages, n)
+                dirty = False
+            
+                # Per-page key range, reused for every keypress on this page
+                max_items = len(page_files)
+                valid_keys = "1-9,0" if max_items == 10 else f"1-{max_items}"
+                navigation = (
+                    "[dim]Navigation: [blue]n[/blue]ext • [blue]p[/blue]rev • [yellow]h[/yellow]elp • "
+                    f"[red]q[/red]uit • [green]{valid_keys}[/green] select[/dim]"
+                )
         
-        console.print(f"[dim]Navigation: [blue]n[/blue]ext • [blue]p[/blue]rev • [yellow]h[/yellow]elp • [red]q[/red]uit • {key_range} select[/dim]")
-        console.print("Select backup file: ", end="", style="bold")
+            # Show navigation instructions and the prompt in a single write
+            console.print(f"{navigation}\n[bold]Select backup file: [/bold]", end="")
         
-        try:
-            key = get_single_keypress()
+            try:
+                key = get_single_keypress()
             
-            if key == 'q':
-                console.print("q")
-                console.print("[yellow]Cancelled[/yellow]")
-                return None
+                if key == 'q':
+                    console.print("q")
+                    console.print("[yellow]Cancelled[/yellow]")
+                    return None
             
-            elif key == 'n':
-                console.print("n")
-                if current_page < total_pages - 1:
-                    current_page += 1
-                else:
-                    console.print("[yellow]Already on last page[/yellow]")
-                    console.print("Press any key to continue...")
-                    get_single_keypress()
+                elif key == 'n':
+                    console.print("n")
+                    if current_page < total_pages - 1:
+                        current_page += 1
+                        dirty = True
+                    else:
+                        console.print("[yellow]Already on last page[/yellow]")
             
-            elif key == 'p':
-                console.print("p")
-                if current_page > 0:
-                    current_page -= 1
-                else:
-                    console.print("[yellow]Already on first page[/yellow]")
-                    console.print("Press any key to continue...")
-                    get_single_keypress()
+                elif key == 'p':
+                    console.print("p")
+                    if current_page > 0:
+                        current_page -= 1
+                        dirty = True
+                    else:
+                        console.print("[yellow]Already on first page[/yellow]")
             
-            elif key == 'h':
-                console.print("h")
-                show_help()
+                elif key == 'h':
+                    console.print("h")
+                    show_help()
             
-            elif key.isdigit():
-                console.print(key)
-                start_idx = current_page * page_size
-                max_items = min(page_size, len(backup_files) - start_idx)
+                elif key.isdigit():
+                    console.print(key)
                 
-                # Handle key mapping: 1-9 for first 9 items, 0 for 10th item
-                if key == '0' and max_items == 10:
-                    # 0 key maps to 10th item (index 9)
-                    selected_idx = start_idx + 9
-                elif key != '0' and 1 <= int(key) <= min(9, max_items):
-                    # 1-9 keys map to items 1-9 (indices 0-8)
-                    selected_idx = start_idx + int(key) - 1
-                else:
-                    # Invalid selection
-                    if max_items == 10:
-                        valid_keys = "1-9,0"
+                    # Handle key mapping: 1-9 for first 9 items, 0 for 10th item
+                    if key == '0' and max_items == 10:
+                        # 0 key maps to 10th item (index 9)
+                        selected_idx = 9
+                    elif key != '0' and 1 <= int(key) <= min(9, max_items):
+                        # 1-9 keys map to items 1-9 (indices 0-8)
+                        selected_idx = int(key) - 1
                     else:
-                        valid_keys = f"1-{max_items}"
-                    console.print(f"[red]Invalid selection. Choose {valid_keys}[/red]")
-                    console.print("Press any key to continue...")
-                    get_single_keypress()
-                    continue
+                        # Invalid selection
+                        console.print(f"[red]Invalid selection. Choose {valid_keys}[/red]")
+                        continue
                 
-                selected_file = backup_files[selected_idx][0]
-                console.print(f"\n[green]✅ Selected:[/green] {selected_file.name}")
-                return selected_file
+                    selected_file = Path(page_files[selected_idx][0])
+                    console.print(f"\n[green]✅ Selected:[/green] {selected_file.name}")
+                    return selected_file
             
-            else:
-                console.print(key)
-                console.print("[yellow]Invalid key. Press 'h' for help.[/yellow]")
-                console.print("Press any key to continue...")
-                get_single_keypress()
+                else:
+                    console.print(key)
+                    console.print("[yellow]Invalid key. Press 'h' for help.[/yellow]")
                 
-        except (KeyboardInterrupt, EOFError):
-            console.print("\n[yellow]Cancelled[/yellow]")
-            return None
-        except Exception as e:
-            console.print(f"\n[red]Error: {e}[/red]")
-            console.print("Press any key to continue...")
-            get_single_keypress()
+            except (KeyboardInterrupt, EOFError):
+                console.print("\n[yellow]Cancelled[/yellow]")
+                return None
+            except Exception as e:
+                console.print(f"\n[red]Error: {e}[/red]")
+
+
+def _find_latest(backup_dir: Path) -> Optional[Path]:
+    """Single O(N) scandir pass for the newest backup; no full sort or list."""
+    best_path: Optional[str] = None
+    best_mtime = float("-inf")
+    try:
+        for entry in _iter_backup_entries(backup_dir):
+            try:
+                mtime = entry.stat().st_mtime
+            except OSError:
+                continue
+            if mtime > best_mtime:
+                best_path, best_mtime = entry.path, mtime
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return Path(best_path) if best_path else None
 
 
 def quick_latest_selector(backup_dir: Path) -> Optional[Path]:
     """Quick selector that returns the latest backup file."""
-    backup_files = get_backup_files(backup_dir)
-    
-    if not backup_files:
-        return None
-    
-    # Return the most recent file (first in sorted list)
-    return backup_files[0][0]
\ No newline at end of file
+    return _find_latest(backup_dir)